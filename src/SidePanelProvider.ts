@@ -209,7 +209,19 @@ export class SidePanelProvider implements vscode.WebviewViewProvider {
       ValidationStateManager.removeListener(onValidationStateChange);
     });
 
+    webviewView.onDidChangeVisibility(() => {
+      if (webviewView.visible) {
+        checkGitStatus();
+      }
+    });
+
     const checkGitStatus = () => {
+      // Repo state changes fire constantly while the user works; skip the
+      // lookup and postMessage entirely when the panel is not visible and
+      // refresh once it is shown again.
+      if (!webviewView.visible) {
+        return;
+      }
       try {
         const gitExtension = vscode.extensions.getExtension<any>("vscode.git");
         if (!gitExtension?.isActive) {
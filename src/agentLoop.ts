@@ -4,6 +4,7 @@ import {
     toGeminiFunctionDeclarations,
     toOpenAITools,
     toAnthropicTools,
+    shrinkDiff,
 } from "./agentTools";
 import { APIProvider, DEFAULT_MODELS, OLLAMA_DEFAULT_HOST } from "./models";
 import {
@@ -13,32 +14,77 @@ import {
     APIRequestError,
     NoChangesError,
 } from "./errors";
-import { ProgressCallback } from "./llmClients";
-import { GitOperations } from "./commitCopilot";
+import { GitOperations, hasDiffContent } from "./commitCopilot";
+import {
+    clearProviderFailure,
+    computeCacheKey,
+    getCachedMessage,
+    getProviderBackoff,
+    isResponseCacheDisabled,
+    recordProviderFailure,
+    storeCachedMessage,
+} from "./responseCache";
+
+export type ProgressCallback = (message: string, increment?: number) => void;
+
+/**
+ * Kick off the provider SDK's dynamic import without awaiting it, so
+ * module loading overlaps the git I/O that runs before the agent loop.
+ * Failures are swallowed here; the awaited import inside the loop will
+ * surface them with proper error handling.
+ */
+export function preloadProviderSDK(provider: APIProvider): void {
+    switch (provider) {
+        case "google":
+            import("@google/generative-ai").catch(() => { });
+            break;
+        case "openai":
+            import("openai").catch(() => { });
+            break;
+        case "anthropic":
+            import("@anthropic-ai/sdk").catch(() => { });
+            break;
+        case "ollama":
+            import("ollama").catch(() => { });
+            break;
+    }
+}
 
 const MAX_AGENT_STEPS = Infinity;
 
 const CONVENTIONAL_COMMIT_TYPES = ["feat", "fix", "docs", "style", "refactor", "perf", "test", "build", "ci", "chore", "revert"];
 
+// Last-resort message when a provider returns empty text even after the
+// forced final-answer turn. Never cached: it carries no information about
+// the diff, and caching it would pin a transient failure to that diff's
+// cache key for the whole TTL.
+const FALLBACK_COMMIT_MESSAGE = "chore(project): update files";
+
+const FINAL_ANSWER_PROMPT =
+    "You have used all available investigation steps. Output ONLY the final commit message now in type(scope): description format. Scope parentheses are MANDATORY. Do NOT include any explanation or analysis — just the commit message.";
+
+
+const COMMIT_SUBJECT_REGEX = new RegExp(
+    `^(${CONVENTIONAL_COMMIT_TYPES.join("|")})(\\([^)]+\\))?(!)?:\\s*.+`,
+    "m",
+);
+
+function firstLineOf(text: string): string {
+    const newlineIndex = text.indexOf("\n");
+    return newlineIndex === -1 ? text : text.slice(0, newlineIndex);
+}
 
 function extractCommitMessage(raw: string): string {
     const trimmed = raw.trim();
 
-    const typesPattern = CONVENTIONAL_COMMIT_TYPES.join("|");
-    const commitRegex = new RegExp(
-        `^(${typesPattern})(\\([^)]+\\))?(!)?:\\s*.+`,
-        "m",
-    );
-
-    const firstLine = trimmed.split("\n")[0];
-    if (commitRegex.test(firstLine)) {
+    if (COMMIT_SUBJECT_REGEX.test(firstLineOf(trimmed))) {
         return trimmed;
     }
 
     const lines = trimmed.split("\n");
     for (let i = 0; i < lines.length; i++) {
         const line = lines[i].trim();
-        if (commitRegex.test(line)) {
+        if (COMMIT_SUBJECT_REGEX.test(line)) {
             return lines
                 .slice(i)
                 .map((l) => l.trimStart())
@@ -51,8 +97,7 @@ function extractCommitMessage(raw: string): string {
         .replace(/^```[\w]*\n?/gm, "")
         .replace(/\n?```\s*$/gm, "")
         .trim();
-    const strippedFirstLine = stripped.split("\n")[0];
-    if (commitRegex.test(strippedFirstLine)) {
+    if (COMMIT_SUBJECT_REGEX.test(firstLineOf(stripped))) {
         return stripped;
     }
 
@@ -155,6 +200,8 @@ interface AgentLoopOptions {
     onProgress?: ProgressCallback;
     isStaged: boolean;
     gitOps: GitOperations;
+    useResponseCache?: boolean;
+    previousMessage?: string;
 }
 
 function formatProgressMessage(step: number, toolName: string, args: any): string {
@@ -206,6 +253,68 @@ export async function runAgentLoop(
 ): Promise<string> {
     const { provider, apiKey, model, diff, repoRoot, onProgress, isStaged, gitOps } = options;
 
+    // A provider that just failed with quota/auth errors will fail again;
+    // short-circuit locally until the backoff window elapses instead of
+    // wasting another round-trip on a retry storm.
+    const backoff = getProviderBackoff(provider, apiKey);
+    if (backoff) {
+        const remainingSecs = Math.ceil(backoff.remainingMs / 1000);
+        if (backoff.code === "QUOTA_EXCEEDED") {
+            throw new APIQuotaExceededError(
+                `retry-after window active, try again in ${remainingSecs}s`,
+            );
+        }
+        throw new APIKeyInvalidError(
+            "recent authentication failure; update the API key or retry later",
+        );
+    }
+
+    if (options.useResponseCache === false || isResponseCacheDisabled()) {
+        return dispatchTracked(options);
+    }
+
+    const modelName = model || DEFAULT_MODELS[provider];
+    const cacheKey = computeCacheKey(provider, modelName, AGENT_SYSTEM_PROMPT, diff);
+    const cached = getCachedMessage(cacheKey);
+    // When the cached message is already sitting in the commit input box,
+    // the user has seen it and is regenerating for a different wording;
+    // serving the cache again would make that retry a no-op, so fall
+    // through to the model instead.
+    if (cached && cached !== options.previousMessage?.trim()) {
+        if (onProgress) {
+            onProgress("Reusing cached commit message for identical diff...");
+        }
+        return cached;
+    }
+
+    const message = await dispatchTracked(options);
+    if (message !== FALLBACK_COMMIT_MESSAGE) {
+        storeCachedMessage(cacheKey, message);
+    }
+    return message;
+}
+
+async function dispatchTracked(options: AgentLoopOptions): Promise<string> {
+    const { provider, apiKey } = options;
+    try {
+        const message = await dispatchAgentLoop(options);
+        clearProviderFailure(provider, apiKey);
+        return message;
+    } catch (error) {
+        if (error instanceof APIQuotaExceededError) {
+            recordProviderFailure(provider, apiKey, "QUOTA_EXCEEDED");
+        } else if (error instanceof APIKeyInvalidError) {
+            recordProviderFailure(provider, apiKey, "API_KEY_INVALID");
+        }
+        throw error;
+    }
+}
+
+async function dispatchAgentLoop(
+    options: AgentLoopOptions,
+): Promise<string> {
+    const { provider, apiKey, model, diff, repoRoot, onProgress, isStaged, gitOps } = options;
+
     switch (provider) {
         case "google":
             return runGeminiAgentLoop(apiKey, model, diff, repoRoot, onProgress, isStaged, gitOps);
@@ -220,6 +329,81 @@ export async function runAgentLoop(
     }
 }
 
+// Provider SDK clients hold keep-alive HTTP agents; reusing an instance
+// across generations reuses its pooled TLS connections instead of paying
+// a fresh handshake per run. Keyed by credential so a changed key or
+// host gets a new client, and capped at one live client per provider:
+// rotating a key must release the old client (and its pooled sockets)
+// rather than pinning it for the rest of the session.
+const providerClientCache = new Map<string, any>();
+
+async function getProviderClient(
+    provider: string,
+    credential: string,
+    create: () => Promise<any>,
+): Promise<any> {
+    const cacheKey = `${provider}:${credential}`;
+    let client = providerClientCache.get(cacheKey);
+    if (!client) {
+        for (const key of providerClientCache.keys()) {
+            if (key.startsWith(`${provider}:`)) {
+                providerClientCache.delete(key);
+            }
+        }
+        client = await create();
+        providerClientCache.set(cacheKey, client);
+    }
+    return client;
+}
+
+function getOpenAIClient(apiKey: string): Promise<any> {
+    return getProviderClient("openai", apiKey, async () => {
+        const OpenAI = (await import("openai")).default;
+        return new OpenAI({ apiKey });
+    });
+}
+
+function getAnthropicClient(apiKey: string): Promise<any> {
+    return getProviderClient("anthropic", apiKey, async () => {
+        const Anthropic = (await import("@anthropic-ai/sdk")).default;
+        return new Anthropic({ apiKey });
+    });
+}
+
+function getOllamaClient(host: string): Promise<any> {
+    return getProviderClient("ollama", host, async () => {
+        const { Ollama } = await import("ollama");
+        return new Ollama({ host });
+    });
+}
+
+// The generative-model handle bundles the (constant) system prompt and
+// tool declarations; memoize it per key+model so that configuration is
+// assembled once per session instead of on every generation.
+const geminiModelCache = new Map<string, any>();
+
+async function getGeminiModel(apiKey: string, modelName: string): Promise<any> {
+    const cacheKey = `${apiKey}:${modelName}`;
+    let generativeModel = geminiModelCache.get(cacheKey);
+    if (!generativeModel) {
+        const { GoogleGenerativeAI } = await import("@google/generative-ai");
+        const client = new GoogleGenerativeAI(apiKey);
+        generativeModel = client.getGenerativeModel({
+            model: modelName,
+            systemInstruction: AGENT_SYSTEM_PROMPT,
+            tools: [
+                {
+                    functionDeclarations:
+                        toGeminiFunctionDeclarations() as any,
+                },
+            ],
+        });
+        geminiModelCache.clear();
+        geminiModelCache.set(cacheKey, generativeModel);
+    }
+    return generativeModel;
+}
+
 async function runGeminiAgentLoop(
     apiKey: string,
     model: string | undefined,
@@ -232,28 +416,16 @@ async function runGeminiAgentLoop(
     if (!apiKey) {
         throw new APIKeyMissingError();
     }
-    if (!diff.trim()) {
+    if (!hasDiffContent(diff)) {
         throw new NoChangesError();
     }
 
     try {
-        const { GoogleGenerativeAI } = await import("@google/generative-ai");
-        const client = new GoogleGenerativeAI(apiKey);
         const modelName = (model || DEFAULT_MODELS.google).replace(
             /^models\//,
             "",
         );
-
-        const generativeModel = client.getGenerativeModel({
-            model: modelName,
-            systemInstruction: AGENT_SYSTEM_PROMPT,
-            tools: [
-                {
-                    functionDeclarations:
-                        toGeminiFunctionDeclarations() as any,
-                },
-            ],
-        });
+        const generativeModel = await getGeminiModel(apiKey, modelName);
 
         const initialContext = buildInitialContext(diff, repoRoot);
         const chat = generativeModel.startChat({ history: [] });
@@ -314,11 +486,9 @@ async function runGeminiAgentLoop(
             step++;
         }
 
-        const finalResponse = await chat.sendMessage(
-            "You have used all available investigation steps. Output ONLY the final commit message now in type(scope): description format. Scope parentheses are MANDATORY. Do NOT include any explanation or analysis — just the commit message.",
-        );
+        const finalResponse = await chat.sendMessage(FINAL_ANSWER_PROMPT);
         const text = finalResponse.response.text();
-        return text ? extractCommitMessage(text) : "chore(project): update files";
+        return text ? extractCommitMessage(text) : FALLBACK_COMMIT_MESSAGE;
     } catch (error: any) {
         if (
             error instanceof NoChangesError ||
@@ -352,13 +522,12 @@ async function runOpenAIAgentLoop(
     if (!apiKey) {
         throw new APIKeyMissingError();
     }
-    if (!diff.trim()) {
+    if (!hasDiffContent(diff)) {
         throw new NoChangesError();
     }
 
     try {
-        const OpenAI = (await import("openai")).default;
-        const client = new OpenAI({ apiKey });
+        const client = await getOpenAIClient(apiKey);
         const modelName = model || DEFAULT_MODELS.openai;
 
         const initialContext = buildInitialContext(diff, repoRoot);
@@ -431,15 +600,14 @@ async function runOpenAIAgentLoop(
 
         messages.push({
             role: "user",
-            content:
-                "You have used all available investigation steps. Output ONLY the final commit message now in type(scope): description format. Scope parentheses are MANDATORY. Do NOT include any explanation or analysis — just the commit message.",
+            content: FINAL_ANSWER_PROMPT,
         });
         const finalCompletion = await client.chat.completions.create({
             model: modelName,
             messages,
         });
         const text = finalCompletion.choices[0]?.message?.content;
-        return text ? extractCommitMessage(text) : "chore(project): update files";
+        return text ? extractCommitMessage(text) : FALLBACK_COMMIT_MESSAGE;
     } catch (error: any) {
         if (
             error instanceof NoChangesError ||
@@ -475,13 +643,12 @@ async function runAnthropicAgentLoop(
     if (!apiKey) {
         throw new APIKeyMissingError();
     }
-    if (!diff.trim()) {
+    if (!hasDiffContent(diff)) {
         throw new NoChangesError();
     }
 
     try {
-        const Anthropic = (await import("@anthropic-ai/sdk")).default;
-        const client = new Anthropic({ apiKey });
+        const client = await getAnthropicClient(apiKey);
         const modelName = model || DEFAULT_MODELS.anthropic;
 
         const initialContext = buildInitialContext(diff, repoRoot);
@@ -557,7 +724,7 @@ async function runAnthropicAgentLoop(
             content: [
                 {
                     type: "text",
-                    text: "You have used all available investigation steps. Output ONLY the final commit message now in type(scope): description format. Scope parentheses are MANDATORY. Do NOT include any explanation or analysis — just the commit message.",
+                    text: FINAL_ANSWER_PROMPT,
                 },
             ],
         });
@@ -573,7 +740,7 @@ async function runAnthropicAgentLoop(
             .filter((b: any) => b.type === "text")
             .map((b: any) => b.text)
             .join("");
-        return text ? extractCommitMessage(text) : "chore(project): update files";
+        return text ? extractCommitMessage(text) : FALLBACK_COMMIT_MESSAGE;
     } catch (error: any) {
         if (
             error instanceof NoChangesError ||
@@ -602,13 +769,12 @@ async function runOllamaAgentLoop(
     repoRoot: string,
     onProgress?: ProgressCallback,
 ): Promise<string> {
-    if (!diff.trim()) {
+    if (!hasDiffContent(diff)) {
         throw new NoChangesError();
     }
 
     try {
-        const { Ollama } = await import("ollama");
-        const client = new Ollama({ host: OLLAMA_DEFAULT_HOST });
+        const client = await getOllamaClient(OLLAMA_DEFAULT_HOST);
         const modelName = model || DEFAULT_MODELS.ollama;
 
         const pullStream = await client.pull({ model: modelName, stream: true });
@@ -636,9 +802,9 @@ async function runOllamaAgentLoop(
         }
 
         const initialContext = buildInitialContext(diff, repoRoot);
-        const enhancedPrompt = `${initialContext}\n\n## Full Diff (provided inline for local model)\n\n${diff}`;
+        const enhancedPrompt = `${initialContext}\n\n## Full Diff (provided inline for local model)\n\n${shrinkDiff(diff)}`;
 
-        const response = await client.chat({
+        const responseStream = await client.chat({
             model: modelName,
             messages: [
                 { role: "system", content: AGENT_SYSTEM_PROMPT },
@@ -648,9 +814,26 @@ async function runOllamaAgentLoop(
                 temperature: 0.7,
                 top_p: 0.95,
             },
+            stream: true,
         });
 
-        const text = response.message?.content;
+        let text = "";
+        let lastReportedLength = 0;
+        for await (const part of responseStream) {
+            const chunk = part.message?.content;
+            if (!chunk) {
+                continue;
+            }
+            text += chunk;
+            // Surface the forming subject line so the user sees progress
+            // token by token instead of a frozen spinner; throttle to
+            // avoid spamming the notification on every chunk.
+            if (onProgress && text.length - lastReportedLength >= 40) {
+                lastReportedLength = text.length;
+                onProgress(`Generating: ${firstLineOf(text).slice(0, 60)}`);
+            }
+        }
+
         if (!text) {
             throw new APIRequestError("Empty response from Ollama");
         }
@@ -94,27 +94,27 @@ function executeGetDiff(
         return "Error: 'path' is required. Please specify a file path to get its diff. Use the file paths from the staged changes summary.";
     }
 
-    const lines = diffContent.split("\n");
-    const fileBlocks: string[] = [];
-    let capturing = false;
-
-    for (const line of lines) {
-        const match = line.match(/^diff --git a\/(.+?) b\/(.+)$/);
-        if (match) {
-            const aPath = match[1];
-            const bPath = match[2];
-            capturing = aPath === filePath || bPath === filePath;
+    // Locate the file's section by scanning header offsets and slicing
+    // once, rather than splitting the entire (possibly multi-megabyte)
+    // diff into a line array on every tool call.
+    const headerRegex = /^diff --git a\/(.+?) b\/(.+)$/gm;
+    let start = -1;
+    let match: RegExpExecArray | null;
+
+    while ((match = headerRegex.exec(diffContent)) !== null) {
+        if (start !== -1) {
+            return diffContent.slice(start, match.index).replace(/\n+$/, "");
         }
-        if (capturing) {
-            fileBlocks.push(line);
+        if (match[1] === filePath || match[2] === filePath) {
+            start = match.index;
         }
     }
 
-    if (fileBlocks.length === 0) {
-        return `No diff found for file: ${filePath}`;
+    if (start !== -1) {
+        return diffContent.slice(start).replace(/\n+$/, "");
     }
 
-    return fileBlocks.join("\n");
+    return `No diff found for file: ${filePath}`;
 }
 
 async function executeReadFile(
@@ -341,7 +341,130 @@ export function parseDiffSummary(
     return files;
 }
 
+const LOW_VALUE_PATH_REGEX =
+    /(^|\/)(package-lock\.json|pnpm-lock\.yaml|yarn\.lock|Cargo\.lock|poetry\.lock|composer\.lock|Gemfile\.lock)$|\.min\.(js|css)$|\.svg$|\.map$|(^|\/)(dist|build|out)\//;
+
+const SHRINK_MAX_CHARS = 8000;
+const SHRINK_PER_FILE_CHARS = 2000;
+
+interface DiffSection {
+    path: string;
+    text: string;
+    lowValue: boolean;
+}
+
+function splitDiffSections(diff: string): DiffSection[] {
+    const sections: DiffSection[] = [];
+    const headerRegex = /^diff --git a\/(.+?) b\/(.+)$/gm;
+
+    let match: RegExpExecArray | null;
+    let prev: { path: string; start: number } | null = null;
+    while ((match = headerRegex.exec(diff)) !== null) {
+        if (prev) {
+            sections.push({
+                path: prev.path,
+                text: diff.slice(prev.start, match.index),
+                lowValue: LOW_VALUE_PATH_REGEX.test(prev.path),
+            });
+        }
+        prev = { path: match[2], start: match.index };
+    }
+    if (prev) {
+        sections.push({
+            path: prev.path,
+            text: diff.slice(prev.start),
+            lowValue: LOW_VALUE_PATH_REGEX.test(prev.path),
+        });
+    }
+
+    return sections;
+}
+
+export function shrinkDiff(
+    diff: string,
+    maxChars: number = SHRINK_MAX_CHARS,
+): string {
+    if (diff.length <= maxChars) {
+        return diff;
+    }
+
+    const sections = splitDiffSections(diff);
+    if (sections.length === 0) {
+        return diff.slice(0, maxChars) + "\n... (diff truncated)";
+    }
+
+    // Demote lockfiles/minified/generated assets to the end so source
+    // changes survive the budget; original order is kept within each group.
+    const ordered = [
+        ...sections.filter((s) => !s.lowValue),
+        ...sections.filter((s) => s.lowValue),
+    ];
+
+    const kept: string[] = [];
+    const omitted: string[] = [];
+    let used = 0;
+
+    for (const section of ordered) {
+        if (used >= maxChars) {
+            omitted.push(section.path);
+            continue;
+        }
+
+        let text = section.text;
+        if (text.length > SHRINK_PER_FILE_CHARS) {
+            text =
+                text.slice(0, SHRINK_PER_FILE_CHARS) +
+                `\n... (diff for ${section.path} truncated)\n`;
+        }
+        if (used + text.length > maxChars) {
+            omitted.push(section.path);
+            continue;
+        }
+
+        kept.push(text);
+        used += text.length;
+    }
+
+    let result = kept.join("");
+    if (omitted.length > 0) {
+        result += `\n... and ${omitted.length} more changed file(s): ${omitted
+            .slice(0, 10)
+            .join(", ")}${omitted.length > 10 ? ", ..." : ""}\n`;
+    }
+    return result;
+}
+
+const PROJECT_TREE_TTL_MS = 30_000;
+const MAX_CACHED_TREES = 8;
+const projectTreeCache = new Map<string, { tree: string; ts: number }>();
+
 export function getProjectStructure(repoRoot: string): string {
+    const cached = projectTreeCache.get(repoRoot);
+    if (cached && Date.now() - cached.ts < PROJECT_TREE_TTL_MS) {
+        return cached.tree;
+    }
+
+    const tree = walkProjectStructure(repoRoot);
+
+    projectTreeCache.set(repoRoot, { tree, ts: Date.now() });
+    if (projectTreeCache.size > MAX_CACHED_TREES) {
+        let oldestKey: string | null = null;
+        let oldestTs = Infinity;
+        for (const [key, value] of projectTreeCache) {
+            if (value.ts < oldestTs) {
+                oldestTs = value.ts;
+                oldestKey = key;
+            }
+        }
+        if (oldestKey !== null) {
+            projectTreeCache.delete(oldestKey);
+        }
+    }
+
+    return tree;
+}
+
+function walkProjectStructure(repoRoot: string): string {
     const IGNORE_DIRS = new Set([
         ".git",
         "node_modules",
@@ -439,29 +562,37 @@ Do NOT guess the commit type based solely on file names.
 REMINDER: When you are done investigating, your ENTIRE text output must be ONLY the commit message in \`type(scope): description\` format — scope parentheses are MANDATORY. No analysis, no explanation, no commentary.`;
 }
 
-export function toGeminiFunctionDeclarations(): object[] {
-    return AGENT_TOOLS.map((tool) => ({
+// AGENT_TOOLS never changes at runtime, so the per-provider payload
+// shapes are built once at module load rather than on every request.
+const GEMINI_FUNCTION_DECLARATIONS: object[] = AGENT_TOOLS.map((tool) => ({
+    name: tool.name,
+    description: tool.description,
+    parameters: tool.parameters,
+}));
+
+const OPENAI_TOOLS: object[] = AGENT_TOOLS.map((tool) => ({
+    type: "function",
+    function: {
         name: tool.name,
         description: tool.description,
         parameters: tool.parameters,
-    }));
+    },
+}));
+
+const ANTHROPIC_TOOLS: object[] = AGENT_TOOLS.map((tool) => ({
+    name: tool.name,
+    description: tool.description,
+    input_schema: tool.parameters,
+}));
+
+export function toGeminiFunctionDeclarations(): object[] {
+    return GEMINI_FUNCTION_DECLARATIONS;
 }
 
 export function toOpenAITools(): object[] {
-    return AGENT_TOOLS.map((tool) => ({
-        type: "function",
-        function: {
-            name: tool.name,
-            description: tool.description,
-            parameters: tool.parameters,
-        },
-    }));
+    return OPENAI_TOOLS;
 }
 
 export function toAnthropicTools(): object[] {
-    return AGENT_TOOLS.map((tool) => ({
-        name: tool.name,
-        description: tool.description,
-        input_schema: tool.parameters,
-    }));
+    return ANTHROPIC_TOOLS;
 }
\ No newline at end of file
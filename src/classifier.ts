@@ -0,0 +1,164 @@
+interface DiffFileSection {
+    aPath: string;
+    bPath: string;
+    renameOnly: boolean;
+    addedLines: string[];
+    removedLines: string[];
+}
+
+// Line patterns are anchored to the manifest's top-level version field:
+// one indent level at most for package.json (nested "version" keys in
+// dependencies or engines sit deeper), column zero for TOML (section
+// bodies like [tool.poetry] keep keys unindented, so a stray indented
+// "version" is not the package version).
+const MANIFEST_VERSION_PATTERNS: { file: RegExp; line: RegExp }[] = [
+    {
+        file: /(^|\/)package\.json$/,
+        line: /^(?: {1,4}|\t)"version":\s*"([^"]+)"/,
+    },
+    { file: /(^|\/)pyproject\.toml$/, line: /^version\s*=\s*"([^"]+)"/ },
+    { file: /(^|\/)Cargo\.toml$/, line: /^version\s*=\s*"([^"]+)"/ },
+];
+
+function parseDiffFileSections(diff: string): DiffFileSection[] {
+    const sections: DiffFileSection[] = [];
+    let current: DiffFileSection | null = null;
+
+    for (const line of diff.split("\n")) {
+        const header = line.match(/^diff --git a\/(.+?) b\/(.+)$/);
+        if (header) {
+            if (current) {
+                sections.push(current);
+            }
+            current = {
+                aPath: header[1],
+                bPath: header[2],
+                renameOnly: false,
+                addedLines: [],
+                removedLines: [],
+            };
+            continue;
+        }
+        if (!current) {
+            continue;
+        }
+        if (line.startsWith("rename from ") || line.startsWith("rename to ")) {
+            current.renameOnly = true;
+        } else if (line.startsWith("+") && !line.startsWith("+++")) {
+            current.addedLines.push(line.slice(1));
+        } else if (line.startsWith("-") && !line.startsWith("---")) {
+            current.removedLines.push(line.slice(1));
+        }
+    }
+    if (current) {
+        sections.push(current);
+    }
+
+    return sections;
+}
+
+function classifyVersionBump(sections: DiffFileSection[]): string | null {
+    if (sections.length !== 1) {
+        return null;
+    }
+    const section = sections[0];
+    const pattern = MANIFEST_VERSION_PATTERNS.find((p) =>
+        p.file.test(section.bPath),
+    );
+    if (
+        !pattern ||
+        section.addedLines.length !== 1 ||
+        section.removedLines.length !== 1
+    ) {
+        return null;
+    }
+
+    const oldMatch = section.removedLines[0].match(pattern.line);
+    const newMatch = section.addedLines[0].match(pattern.line);
+    if (!oldMatch || !newMatch || oldMatch[1] === newMatch[1]) {
+        return null;
+    }
+
+    return (
+        `chore(release): bump version from ${oldMatch[1]} to ${newMatch[1]}\n\n` +
+        `Version-only change in ${section.bPath}; no code changes.`
+    );
+}
+
+function classifyRenameOnly(sections: DiffFileSection[]): string | null {
+    const allRenames = sections.every(
+        (s) =>
+            s.renameOnly &&
+            s.addedLines.length === 0 &&
+            s.removedLines.length === 0,
+    );
+    if (!allRenames) {
+        return null;
+    }
+
+    if (sections.length === 1) {
+        const { aPath, bPath } = sections[0];
+        return (
+            `chore(project): rename ${aPath} to ${bPath}\n\n` +
+            "Pure rename with no content changes."
+        );
+    }
+    const renameList = sections
+        .map((s) => `${s.aPath} -> ${s.bPath}`)
+        .join(", ");
+    return (
+        `chore(project): rename ${sections.length} files\n\n` +
+        `Pure renames with no content changes: ${renameList}.`
+    );
+}
+
+function classifyWhitespaceOnly(sections: DiffFileSection[]): string | null {
+    for (const section of sections) {
+        // A section with no +/- lines is not "no change": it can be a
+        // binary change, a mode flip, or a rename. Those need the model
+        // (or the dedicated rename rule), so never absorb them here.
+        if (
+            section.addedLines.length === 0 &&
+            section.removedLines.length === 0
+        ) {
+            return null;
+        }
+        const added = section.addedLines
+            .map((l) => l.trim())
+            .filter((l) => l.length > 0);
+        const removed = section.removedLines
+            .map((l) => l.trim())
+            .filter((l) => l.length > 0);
+        if (
+            added.length !== removed.length ||
+            added.some((line, i) => line !== removed[i])
+        ) {
+            return null;
+        }
+    }
+
+    const fileCount = sections.length;
+    return (
+        `style(project): adjust whitespace and formatting\n\n` +
+        `Whitespace-only changes across ${fileCount} file(s); no logic changes.`
+    );
+}
+
+/**
+ * Deterministically classify mechanical diffs (version bump, pure rename,
+ * whitespace-only) so those commits skip the LLM round-trip entirely.
+ * Returns null whenever the diff is anything more interesting, leaving
+ * the decision to the agent.
+ */
+export function classifyTrivialDiff(diff: string): string | null {
+    const sections = parseDiffFileSections(diff);
+    if (sections.length === 0) {
+        return null;
+    }
+
+    return (
+        classifyVersionBump(sections) ||
+        classifyRenameOnly(sections) ||
+        classifyWhitespaceOnly(sections)
+    );
+}
@@ -1,9 +1,17 @@
-import { APIProvider, DEFAULT_MODELS } from "./models";
-import { createLLMClient, ProgressCallback } from "./llmClients";
-import { runAgentLoop } from "./agentLoop";
+import { APIProvider, DEFAULT_MODELS, PROVIDER_DISPLAY_NAMES } from "./models";
+import {
+  runAgentLoop,
+  preloadProviderSDK,
+  ProgressCallback,
+} from "./agentLoop";
+import { classifyTrivialDiff } from "./classifier";
 import {
   EXIT_CODES,
   CommitCopilotError,
+  CommitFailedError,
+  APIKeyInvalidError,
+  APIQuotaExceededError,
+  APIRequestError,
   NoChangesError,
   NoChangesButUntrackedError,
   NoTrackedChangesButUntrackedError,
@@ -15,6 +23,7 @@ export {
   EXIT_CODES,
   ERROR_MESSAGES,
   CommitCopilotError,
+  CommitFailedError,
   APIKeyMissingError,
   APIKeyInvalidError,
   APIQuotaExceededError,
@@ -28,6 +37,15 @@ export {
 
 const STATUS_UNTRACKED = 7;
 
+/**
+ * Emptiness probe that stops at the first non-whitespace character,
+ * unlike `diff.trim()` which allocates a full copy of a potentially
+ * multi-megabyte diff just to test truthiness.
+ */
+export function hasDiffContent(diff: string): boolean {
+  return /\S/.test(diff);
+}
+
 interface GitChange {
   readonly uri: { fsPath: string };
   readonly status: number;
@@ -51,10 +69,6 @@ export interface GitRepository {
 export class GitOperations {
   constructor(private readonly repository: GitRepository) { }
 
-  async isGitRepo(): Promise<boolean> {
-    return true;
-  }
-
   async getDiff(staged: boolean = true): Promise<string> {
     try {
       const diff = await this.repository.diff(staged);
@@ -75,6 +89,10 @@ export class GitOperations {
     }
   }
 
+  async hasStagedChanges(): Promise<boolean> {
+    return this.repository.state.indexChanges.length > 0;
+  }
+
   async hasMixedChanges(): Promise<boolean> {
     const hasStaged = this.repository.state.indexChanges.length > 0;
     const hasUnstaged = this.repository.state.workingTreeChanges.length > 0;
@@ -102,13 +120,21 @@ export class GitOperations {
     }
   }
 
-  async commitChanges(message: string): Promise<boolean> {
+  async commitChanges(message: string): Promise<void> {
     try {
       await this.repository.commit(message);
-      return true;
-    } catch (error) {
-      console.error("Error committing changes:", error);
-      return false;
+    } catch (error: any) {
+      const detail = error?.stderr || error?.message || String(error);
+
+      // Distinguish "nothing to commit" from genuine commit failures
+      // (e.g. a failing pre-commit hook) instead of collapsing both
+      // into a silent boolean.
+      if (typeof detail === "string" && detail.includes("nothing to commit")) {
+        throw new NoChangesError();
+      }
+      throw new CommitFailedError(
+        typeof detail === "string" ? detail.trim() : undefined,
+      );
     }
   }
 
@@ -139,6 +165,12 @@ export class GitOperations {
   }
 }
 
+export interface FallbackProvider {
+  provider: APIProvider;
+  apiKey: string;
+  model?: string;
+}
+
 export interface GenerateCommitMessageOptions {
   repository: GitRepository;
   provider: APIProvider;
@@ -148,6 +180,8 @@ export interface GenerateCommitMessageOptions {
   ignoreUntracked?: boolean;
   onProgress?: ProgressCallback;
   proceedWithStagedOnly?: boolean;
+  fallbackProviders?: FallbackProvider[];
+  useResponseCache?: boolean;
 }
 
 export interface GenerateCommitMessageResult {
@@ -168,16 +202,15 @@ export async function generateCommitMessage(
     ignoreUntracked = false,
     onProgress,
     proceedWithStagedOnly = false,
+    fallbackProviders = [],
+    useResponseCache = true,
   } = options;
   try {
     const gitOps = new GitOperations(repository);
-    if (!(await gitOps.isGitRepo())) {
-      throw new CommitCopilotError(
-        "Not a git repository. Please run this command inside a git repository.",
-        "NOT_GIT_REPO",
-        EXIT_CODES.NOT_GIT_REPO,
-      );
-    }
+
+    // Start loading the provider SDK now so it happens concurrently with
+    // the staging/diff round-trips below.
+    preloadProviderSDK(provider);
 
     if (stageChanges) {
       const staged = await gitOps.stageAllChanges();
@@ -189,12 +222,18 @@ export async function generateCommitMessage(
     }
 
     let isStaged = true;
-    let diff = await gitOps.getDiff(true);
+    // When we are not staging anything ourselves and the index is already
+    // known to be empty, skip the staged-diff round-trip entirely instead
+    // of asking git for a diff that must come back blank.
+    let diff = "";
+    if (stageChanges || (await gitOps.hasStagedChanges())) {
+      diff = await gitOps.getDiff(true);
+    }
 
-    if (!diff.trim() && !stageChanges) {
+    if (!hasDiffContent(diff) && !stageChanges) {
       const unstagedDiff = await gitOps.getDiff(false);
       if (!ignoreUntracked && await gitOps.hasUntrackedFiles()) {
-        if (!unstagedDiff.trim()) {
+        if (!hasDiffContent(unstagedDiff)) {
           throw new NoTrackedChangesButUntrackedError();
         } else {
           throw new NoChangesButUntrackedError();
@@ -204,20 +243,89 @@ export async function generateCommitMessage(
       isStaged = false;
     }
 
-    if (!diff.trim()) {
+    if (!hasDiffContent(diff)) {
       throw new NoChangesError();
     }
+    const deterministicMessage = classifyTrivialDiff(diff);
+    if (deterministicMessage) {
+      if (onProgress) {
+        onProgress("Trivial change detected, skipping LLM call...");
+      }
+      return {
+        success: true,
+        message: deterministicMessage,
+      };
+    }
+
     const repoRoot = repository.rootUri.fsPath;
-    const commitMessage = await runAgentLoop({
-      provider,
-      apiKey,
-      model: model || DEFAULT_MODELS[provider],
-      diff,
-      repoRoot,
-      onProgress,
-      isStaged,
-      gitOps,
-    });
+    let commitMessage: string;
+    try {
+      commitMessage = await runAgentLoop({
+        provider,
+        apiKey,
+        model: model || DEFAULT_MODELS[provider],
+        diff,
+        repoRoot,
+        onProgress,
+        isStaged,
+        gitOps,
+        useResponseCache,
+        previousMessage: repository.inputBox.value,
+      });
+    } catch (error) {
+      // Quota exhaustion and transient API failures degrade gracefully to
+      // the user's other configured providers instead of hard-failing.
+      // Fallbacks run sequentially: racing providers in parallel would
+      // spend tokens on responses that get thrown away.
+      const recoverable =
+        error instanceof APIQuotaExceededError ||
+        error instanceof APIRequestError;
+      if (!recoverable || fallbackProviders.length === 0) {
+        throw error;
+      }
+
+      let recovered: string | null = null;
+      // Name the provider that actually just failed, which after the
+      // first iteration is the previous fallback, not the primary.
+      let failedProvider = provider;
+      for (const fallback of fallbackProviders) {
+        if (onProgress) {
+          onProgress(
+            `${PROVIDER_DISPLAY_NAMES[failedProvider]} failed, trying ${PROVIDER_DISPLAY_NAMES[fallback.provider]}...`,
+          );
+        }
+        try {
+          recovered = await runAgentLoop({
+            provider: fallback.provider,
+            apiKey: fallback.apiKey,
+            model: fallback.model || DEFAULT_MODELS[fallback.provider],
+            diff,
+            repoRoot,
+            onProgress,
+            isStaged,
+            gitOps,
+            useResponseCache,
+            previousMessage: repository.inputBox.value,
+          });
+          break;
+        } catch (fallbackError) {
+          if (
+            fallbackError instanceof APIQuotaExceededError ||
+            fallbackError instanceof APIRequestError ||
+            fallbackError instanceof APIKeyInvalidError
+          ) {
+            failedProvider = fallback.provider;
+            continue;
+          }
+          throw fallbackError;
+        }
+      }
+
+      if (recovered === null) {
+        throw error;
+      }
+      commitMessage = recovered;
+    }
     return {
       success: true,
       message: commitMessage,
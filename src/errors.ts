@@ -169,6 +169,17 @@ export class MixedChangesError extends CommitCopilotError {
   }
 }
 
+export class CommitFailedError extends CommitCopilotError {
+  constructor(details?: string) {
+    super(
+      `Failed to commit changes${details ? `: ${details}` : ""}`,
+      "COMMIT_FAILED",
+      EXIT_CODES.COMMIT_FAILED,
+    );
+    this.name = "CommitFailedError";
+  }
+}
+
 export class StageFailedError extends CommitCopilotError {
   constructor(details?: string) {
     super(
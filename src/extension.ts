@@ -1,11 +1,6 @@
 import * as vscode from "vscode";
 import { SidePanelProvider } from "./SidePanelProvider";
-import {
-  generateCommitMessage,
-  EXIT_CODES,
-  ERROR_MESSAGES,
-  CommitCopilotError,
-} from "./commitCopilot";
+import type { FallbackProvider } from "./commitCopilot";
 import {
   APIProvider,
   API_KEY_STORAGE_KEYS,
@@ -63,6 +58,39 @@ export class ValidationStateManager {
   }
 }
 
+/**
+ * Other cloud providers the user has configured, in declaration order,
+ * used as graceful fallbacks when the primary provider hits quota or a
+ * transient API failure. Ollama is excluded: silently pulling a local
+ * model as a "fallback" would be surprising.
+ */
+async function collectFallbackProviders(
+  context: vscode.ExtensionContext,
+  currentProvider: APIProvider,
+): Promise<FallbackProvider[]> {
+  const fallbacks: FallbackProvider[] = [];
+  for (const [provider, storageKey] of Object.entries(API_KEY_STORAGE_KEYS)) {
+    if (provider === currentProvider || provider === "ollama") {
+      continue;
+    }
+    const apiKey = await context.secrets.get(storageKey);
+    if (apiKey) {
+      fallbacks.push({
+        provider: provider as APIProvider,
+        apiKey,
+        model: context.globalState.get<string>(
+          `${provider.toUpperCase()}_MODEL`,
+        ),
+      });
+    }
+  }
+  return fallbacks;
+}
+
+// Last repository a generation ran against; revalidated against the Git
+// API on each invocation so a closed repository is never reused.
+let lastUsedRepository: any = null;
+
 export function activate(context: vscode.ExtensionContext) {
   console.log("Commit-Copilot extension is now active!");
 
@@ -90,6 +118,11 @@ export function activate(context: vscode.ExtensionContext) {
       );
 
       try {
+        // Loaded lazily so activating the extension (e.g. opening the side
+        // panel) does not pay for the generation pipeline's module graph.
+        const { generateCommitMessage, EXIT_CODES, ERROR_MESSAGES } =
+          await import("./commitCopilot");
+
         outputChannel.appendLine("=".repeat(50));
         outputChannel.appendLine(
           `[${new Date().toISOString()}] Starting commit-copilot generation...`,
@@ -128,6 +161,17 @@ export function activate(context: vscode.ExtensionContext) {
           }
         }
 
+        if (
+          !repository &&
+          lastUsedRepository &&
+          api.repositories.includes(lastUsedRepository)
+        ) {
+          repository = lastUsedRepository;
+          outputChannel.appendLine(
+            `Reusing repository from previous run: ${repository.rootUri.fsPath}`,
+          );
+        }
+
         if (!repository) {
           if (api.repositories.length > 0) {
             outputChannel.appendLine(
@@ -148,6 +192,7 @@ export function activate(context: vscode.ExtensionContext) {
           );
           return;
         }
+        lastUsedRepository = repository;
 
         const currentProvider =
           context.globalState.get<APIProvider>("CURRENT_PROVIDER") ||
@@ -199,12 +244,23 @@ export function activate(context: vscode.ExtensionContext) {
               outputChannel.appendLine(`Using model: ${savedModel}`);
             }
 
+            const fallbackProviders = await collectFallbackProviders(
+              context,
+              currentProvider,
+            );
+
+            const useResponseCache = vscode.workspace
+              .getConfiguration("commit-copilot")
+              .get<boolean>("responseCache", true);
+
             let result = await generateCommitMessage({
               repository,
               provider: currentProvider,
               apiKey: apiKey || "",
               stageChanges: false,
               model: savedModel,
+              fallbackProviders,
+              useResponseCache,
               onProgress: (message, increment) => {
                 outputChannel.appendLine(message);
                 progress.report({ message, increment });
@@ -226,6 +282,8 @@ export function activate(context: vscode.ExtensionContext) {
                   apiKey: apiKey || "",
                   stageChanges: true,
                   model: savedModel,
+                  fallbackProviders,
+                  useResponseCache,
                   onProgress: (message, increment) => {
                     outputChannel.appendLine(message);
                     progress.report({ message, increment });
@@ -239,6 +297,8 @@ export function activate(context: vscode.ExtensionContext) {
                   stageChanges: false,
                   proceedWithStagedOnly: true,
                   model: savedModel,
+                  fallbackProviders,
+                  useResponseCache,
                   onProgress: (message, increment) => {
                     outputChannel.appendLine(message);
                     progress.report({ message, increment });
@@ -263,6 +323,8 @@ export function activate(context: vscode.ExtensionContext) {
                   apiKey: apiKey || "",
                   stageChanges: true,
                   model: savedModel,
+                  fallbackProviders,
+                  useResponseCache,
                   onProgress: (message, increment) => {
                     outputChannel.appendLine(message);
                     progress.report({ message, increment });
@@ -276,6 +338,8 @@ export function activate(context: vscode.ExtensionContext) {
                   stageChanges: false,
                   ignoreUntracked: true,
                   model: savedModel,
+                  fallbackProviders,
+                  useResponseCache,
                   onProgress: (message, increment) => {
                     outputChannel.appendLine(message);
                     progress.report({ message, increment });
@@ -296,6 +360,8 @@ export function activate(context: vscode.ExtensionContext) {
                   apiKey: apiKey || "",
                   stageChanges: true,
                   model: savedModel,
+                  fallbackProviders,
+                  useResponseCache,
                   onProgress: (message, increment) => {
                     outputChannel.appendLine(message);
                     progress.report({ message, increment });
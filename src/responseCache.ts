@@ -0,0 +1,163 @@
+import * as crypto from "crypto";
+import * as fs from "fs";
+import * as os from "os";
+import * as path from "path";
+
+const CACHE_DIR = path.join(os.homedir(), ".cache", "commit-copilot");
+const CACHE_FILE = path.join(CACHE_DIR, "responses.json");
+const CACHE_TTL_MS = 7 * 24 * 60 * 60 * 1000;
+const MAX_ENTRIES = 200;
+
+interface CacheEntry {
+    message: string;
+    ts: number;
+}
+
+let entries: Record<string, CacheEntry> | null = null;
+
+export function isResponseCacheDisabled(): boolean {
+    return process.env.COMMIT_COPILOT_NOCACHE === "1";
+}
+
+export function computeCacheKey(
+    provider: string,
+    model: string,
+    systemPrompt: string,
+    diff: string,
+): string {
+    return crypto
+        .createHash("sha256")
+        .update(`${provider}\0${model}\0${systemPrompt}\0${diff}`)
+        .digest("hex");
+}
+
+function loadEntries(): Record<string, CacheEntry> {
+    if (entries) {
+        return entries;
+    }
+    entries = {};
+    try {
+        if (fs.existsSync(CACHE_FILE)) {
+            const parsed = JSON.parse(fs.readFileSync(CACHE_FILE, "utf-8"));
+            const now = Date.now();
+            for (const [key, value] of Object.entries(parsed)) {
+                const entry = value as CacheEntry;
+                if (
+                    entry &&
+                    typeof entry.message === "string" &&
+                    typeof entry.ts === "number" &&
+                    now - entry.ts < CACHE_TTL_MS
+                ) {
+                    entries[key] = entry;
+                }
+            }
+        }
+    } catch (error) {
+        console.error("Error loading response cache:", error);
+        entries = {};
+    }
+    return entries;
+}
+
+function persistEntries(current: Record<string, CacheEntry>): void {
+    try {
+        fs.mkdirSync(CACHE_DIR, { recursive: true });
+        // Write-then-rename so a crash mid-write can never leave a
+        // truncated cache file behind.
+        const tmpFile = `${CACHE_FILE}.${process.pid}.tmp`;
+        fs.writeFileSync(tmpFile, JSON.stringify(current));
+        fs.renameSync(tmpFile, CACHE_FILE);
+    } catch (error) {
+        console.error("Error persisting response cache:", error);
+    }
+}
+
+export function getCachedMessage(key: string): string | null {
+    const current = loadEntries();
+    const entry = current[key];
+    if (!entry) {
+        return null;
+    }
+    if (Date.now() - entry.ts >= CACHE_TTL_MS) {
+        delete current[key];
+        return null;
+    }
+    return entry.message;
+}
+
+const QUOTA_BACKOFF_MS = 30_000;
+const AUTH_BACKOFF_MS = 5 * 60 * 1000;
+
+export type ProviderFailureCode = "QUOTA_EXCEEDED" | "API_KEY_INVALID";
+
+interface ProviderFailure {
+    code: ProviderFailureCode;
+    ts: number;
+}
+
+// Negative-result cache: remembers the last quota/auth failure per
+// provider+key so an immediate retry short-circuits locally instead of
+// burning another network round-trip on a known-bad request. In-memory
+// only — the extension host outlives individual generations, which is
+// the retry-storm window this protects against.
+const providerFailures = new Map<string, ProviderFailure>();
+
+function failureKey(provider: string, apiKey: string): string {
+    const keyHash = crypto
+        .createHash("sha256")
+        .update(apiKey)
+        .digest("hex")
+        .slice(0, 16);
+    return `${provider}:${keyHash}`;
+}
+
+function backoffWindowMs(code: ProviderFailureCode): number {
+    return code === "QUOTA_EXCEEDED" ? QUOTA_BACKOFF_MS : AUTH_BACKOFF_MS;
+}
+
+export function recordProviderFailure(
+    provider: string,
+    apiKey: string,
+    code: ProviderFailureCode,
+): void {
+    providerFailures.set(failureKey(provider, apiKey), {
+        code,
+        ts: Date.now(),
+    });
+}
+
+export function clearProviderFailure(provider: string, apiKey: string): void {
+    providerFailures.delete(failureKey(provider, apiKey));
+}
+
+export function getProviderBackoff(
+    provider: string,
+    apiKey: string,
+): { code: ProviderFailureCode; remainingMs: number } | null {
+    const key = failureKey(provider, apiKey);
+    const failure = providerFailures.get(key);
+    if (!failure) {
+        return null;
+    }
+    const remainingMs = failure.ts + backoffWindowMs(failure.code) - Date.now();
+    if (remainingMs <= 0) {
+        providerFailures.delete(key);
+        return null;
+    }
+    return { code: failure.code, remainingMs };
+}
+
+export function storeCachedMessage(key: string, message: string): void {
+    const current = loadEntries();
+    current[key] = { message, ts: Date.now() };
+
+    const keys = Object.keys(current);
+    if (keys.length > MAX_ENTRIES) {
+        keys.sort((a, b) => current[a].ts - current[b].ts);
+        for (const stale of keys.slice(0, keys.length - MAX_ENTRIES)) {
+            delete current[stale];
+        }
+    }
+
+    persistEntries(current);
+}